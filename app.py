@@ -1,10 +1,17 @@
-from flask import Flask, render_template, jsonify, request, redirect, session, url_for
-from flask_sqlalchemy import SQLAlchemy
+from flask import Flask, render_template, jsonify, request, redirect, session, url_for, send_from_directory, abort
 from flask_wtf import CSRFProtect
-from src.models import db, Course, User, Tag
-from typing import List
+from src.models import db, Course, User, Tag, Job
 from src.utils import calculate_relevancy_points, get_logged_in_user
-from sqlalchemy.exc import IntegrityError
+from src.catalog import get_catalog, get_course_stats, bump_catalog_version
+from src.bootstrap import configure_db
+from src.commands import register_commands
+from src.course_attributes import apply_course_attributes
+from src.facets import FACETS, parse_facet_filters, facet_search
+from src.jobs import JOBS, fail_interrupted_jobs, init_jobs, job_to_dict
+from src.suggest import DEFAULT_LIMIT, MAX_LIMIT, get_suggest_index
+from src.paths import get_learning_paths
+from src.profiling import PROFILE_NAME_RE, init_profiling, list_profiles, profile_dir, profile_summary
+import src.tasks  # Registers the catalogue jobs
 from flask_migrate import Migrate
 import os
 
@@ -14,18 +21,26 @@ app.secret_key = "your_secret_key"  # Ensure this is set for session management
 # Initialize CSRF protection
 csrf = CSRFProtect(app)
 
-# Database configuration
-app.config["SQLALCHEMY_DATABASE_URI"] = (
-    "sqlite:///your_database.db"  # Change this to your database URI
-)
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-# Initialize the database
-db.init_app(app)
+# Database configuration (shared with the CLI scripts, see src/bootstrap.py)
+configure_db(app)
 
 # Initialize Flask-Migrate
 migrate = Migrate(app, db)
 
+# Register the maintenance commands (flask setup-db, flask import-courses, ...)
+register_commands(app)
+
+# Background jobs for catalogue-wide work (see src/tasks.py)
+jobs = init_jobs(app)
+
+# Opt-in request profiling: set PROFILE_SAMPLE_RATE, or send X-Profile as admin
+try:
+    app.config["PROFILE_SAMPLE_RATE"] = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+except ValueError:
+    app.logger.warning("Ignoring invalid PROFILE_SAMPLE_RATE=%r", os.environ["PROFILE_SAMPLE_RATE"])
+    app.config["PROFILE_SAMPLE_RATE"] = 0.0
+init_profiling(app)
+
 
 # Define your routes
 @app.route("/")
@@ -41,8 +56,9 @@ def index():
 
 @app.route("/courses", methods=["GET", "POST"])
 def courses_page():
-    # Fetch active courses
-    courses = Course.query.filter_by(status="active").all()
+    # Fetch active courses from the in-memory catalogue snapshot
+    catalog = get_catalog()
+    courses = catalog.active_courses
 
     # Get the current logged-in user
     user = get_logged_in_user()
@@ -50,8 +66,8 @@ def courses_page():
     # Split user tags by space
     user_tags = set(user.tags.split()) if user and user.tags else set()
 
-    # Query all tags from the database
-    all_tags = Tag.query.all()
+    # All tags come from the same snapshot
+    all_tags = catalog.tags
 
     # Prepare quiz questions (as before)
     quiz_questions = [
@@ -127,7 +143,7 @@ def courses_page():
     ]
 
     # Calculate relevancy points - simplified version
-    sorted_courses = calculate_relevancy_points(courses, user_tags)
+    sorted_courses = calculate_relevancy_points(courses, user_tags, stats=get_course_stats())
 
     return render_template(
         "courses.html",
@@ -146,7 +162,8 @@ def about_page():
 @app.route("/api/courses")
 def get_courses():
     try:
-        courses = Course.query.filter_by(status="active").all()
+        courses = get_catalog().active_courses
+        stats = get_course_stats()
         return jsonify([
             {
                 "id": course.id,
@@ -154,6 +171,9 @@ def get_courses():
                 "description": course.description,
                 "duration": course.duration,
                 "status": course.status,
+                "average_rating": stats[course.id].average_rating,
+                "rating_count": stats[course.id].rating_count,
+                "enrollment_count": stats[course.id].enrollment_count,
             }
             for course in courses
         ])
@@ -161,6 +181,59 @@ def get_courses():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/courses/facets")
+def get_course_facets():
+    try:
+        catalog = get_catalog()
+        filters = parse_facet_filters(request.args)
+        courses, counts = facet_search(catalog, filters)
+        stats = get_course_stats()
+        return jsonify({
+            "version": catalog.version,
+            "filters": {facet: list(values) for facet, values in filters},
+            "results": [
+                {
+                    "id": course.id,
+                    "title": course.title,
+                    "description": course.description,
+                    "duration": course.duration,
+                    "duration_hours": course.duration_hours,
+                    "level": course.level_number,
+                    "type": course.course_type,
+                    "language": course.language,
+                    "provider": course.provider,
+                    "organization": course.organization,
+                    "cost": course.cost_type,
+                    "average_rating": stats[course.id].average_rating,
+                    "enrollment_count": stats[course.id].enrollment_count,
+                }
+                for course in courses
+            ],
+            "facets": {facet: counts[facet] for facet in FACETS},
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/suggest")
+def suggest():
+    prefix = request.args.get("prefix", "")
+    limit = min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT)
+    index = get_suggest_index(get_catalog())
+    return jsonify(index.suggest(prefix, limit, stats=get_course_stats()))
+
+
+@app.route("/api/paths")
+def get_paths():
+    topic = request.args.get("topic", "").upper()
+    level = request.args.get("level", 1, type=int)
+    paths = get_learning_paths(get_catalog(), get_course_stats())
+    if (topic, level) not in paths:
+        topics = sorted({path_topic for path_topic, _ in paths})
+        return jsonify(error="Unknown topic or level.", topics=topics), 404
+    return jsonify({"topic": topic, "level": level, "courses": paths[(topic, level)]})
+
+
 @app.route("/manage_courses", methods=["GET", "POST"])
 def manage_courses():
     # Example: Get a specific course by ID
@@ -247,46 +320,47 @@ def remove_tag():
 
 @app.route("/collect_tags", methods=["POST"])
 def collect_tags():
-    # Start een database sessie
-    with db.session.begin():
-        # Haal alle courses op
-        courses = Course.query.all()
-
-        # Set om unieke tags op te slaan
-        unique_tags = set()
-
-        # Loop door elke course en verzamel tags
-        for course in courses:
-            if course.tags:
-                # Split tags op spaties
-                tags = course.tags.split()
-                # Voeg elke tag toe aan de set van unieke tags
-                unique_tags.update(tags)
-
-        # Voeg unieke tags toe aan de Tags tabel
-        for tag_name in unique_tags:
-            # Controleer of de tag al bestaat
-            existing_tag = Tag.query.filter_by(tag_name=tag_name).first()
-            if not existing_tag:
-                # Voeg de nieuwe tag toe
-                new_tag = Tag(tag_name=tag_name)
-                db.session.add(new_tag)
-
-        # Commit de sessie
-        try:
-            db.session.commit()
-            print("Tags succesvol verzameld en toegevoegd.")
-        except IntegrityError:
-            db.session.rollback()
-            print("Er is een fout opgetreden bij het toevoegen van tags.")
+    # Verzamelen gebeurt als achtergrondtaak, zodat het request direct terugkeert
+    job_id = jobs.enqueue("collect_tags")
+    status_url = url_for("get_job", job_id=job_id)
+    if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        return jsonify(id=job_id, status_url=status_url), 202, {"Location": status_url}
+    return redirect(url_for("show_collected_tags", job_id=job_id))
 
-    return redirect(url_for("show_collected_tags"))
+
+@app.route("/api/jobs", methods=["GET", "POST"])
+def job_list():
+    if session.get("username") != "admin":
+        return jsonify(error="Admin only."), 403
+
+    if request.method == "POST":
+        data = request.get_json(silent=True) or request.form
+        name = data.get("name")
+        params = data.get("params") or {}
+        if name not in JOBS or not isinstance(params, dict):
+            return jsonify(error=f"Unknown job: {name}", jobs=sorted(JOBS)), 400
+        job_id = jobs.enqueue(name, **params)
+        status_url = url_for("get_job", job_id=job_id)
+        return jsonify(id=job_id, status_url=status_url), 202, {"Location": status_url}
+
+    recent_jobs = Job.query.order_by(Job.id.desc()).limit(50).all()
+    return jsonify([job_to_dict(job) for job in recent_jobs])
+
+
+@app.route("/api/jobs/<int:job_id>")
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify(error="Job not found."), 404
+    # Anyone may poll a job's progress (see show_collected_tags.html), only admins see its details
+    return jsonify(job_to_dict(job, details=session.get("username") == "admin"))
 
 
 @app.route("/show_collected_tags")
 def show_collected_tags():
     tags = Tag.query.all()
-    return render_template("show_collected_tags.html", tags=tags)
+    job_id = request.args.get("job_id", type=int)
+    return render_template("show_collected_tags.html", tags=tags, job_id=job_id)
 
 
 @app.route("/save_course", methods=["POST"])
@@ -322,6 +396,8 @@ def save_course():
                 course.duration = duration
                 course.status = status
                 course.tags = tags
+                course.link_deactivated = False  # An admin's choice of status overrides the link checker
+                apply_course_attributes(course, duration=duration)
         else:
             # Create new course
             print("Creating new course")
@@ -332,8 +408,11 @@ def save_course():
                 status=status,
                 tags=tags
             )
+            apply_course_attributes(course, duration=duration)
             db.session.add(course)
 
+        bump_catalog_version()
+
         # Commit changes
         db.session.commit()
         print("Course saved successfully")
@@ -370,6 +449,7 @@ def edit_tag(tag_id):
         tag = Tag.query.get(tag_id)
         if tag and tag_name:
             tag.tag_name = tag_name
+            bump_catalog_version()
             db.session.commit()
     return redirect(url_for("show_collected_tags"))
 
@@ -380,11 +460,41 @@ def delete_tag(tag_id):
         tag = Tag.query.get(tag_id)
         if tag:
             db.session.delete(tag)
+            bump_catalog_version()
             db.session.commit()
     return redirect(url_for("show_collected_tags"))
 
 
+@app.route("/admin/profiles")
+def admin_profiles():
+    if session.get("username") != "admin":
+        return jsonify(error="Admin only."), 403
+    return jsonify(list_profiles(app))
+
+
+@app.route("/admin/profiles/<name>")
+def admin_profile(name):
+    if session.get("username") != "admin":
+        return jsonify(error="Admin only."), 403
+    if not PROFILE_NAME_RE.match(name):
+        abort(404)
+    directory = profile_dir(app)
+    if request.args.get("format") == "text":
+        # Quick look without downloading: top functions by cumulative time
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            abort(404)
+        sort = request.args.get("sort", "cumulative")
+        if sort not in ("cumulative", "tottime", "calls"):
+            sort = "cumulative"
+        return profile_summary(path, sort=sort), 200, {"Content-Type": "text/plain; charset=utf-8"}
+    return send_from_directory(directory, name, as_attachment=True)
+
+
 if __name__ == "__main__":
+    # This process runs the jobs; anything a previous run left queued or running will never finish
+    with app.app_context():
+        fail_interrupted_jobs()
     # Get the port from the environment variable, default to 5000 if not set
     port = int(os.environ.get("PORT", 5001))
     # Run the app on the specified port
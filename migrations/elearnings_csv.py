@@ -0,0 +1,55 @@
+"""Match existing courses to their row in data/Elearnings.csv
+
+Used by the revisions that backfill new course columns from the CSV. Like the
+frozen parsers in those revisions, this deliberately doesn't import app code.
+"""
+import csv
+import os
+
+import sqlalchemy as sa
+
+CSV_FILE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Elearnings.csv')
+
+# Levels as the sample courses in add-courses store them; imported courses use the CSV's numbers
+_LEVEL_NUMBERS = {"beginner": "1", "intermediate": "2", "advanced": "3"}
+
+
+def _key(title, level, duration):
+    level = (level or '').strip().casefold()
+    return (title or '').strip(), _LEVEL_NUMBERS.get(level, level), (duration or '').strip().casefold()
+
+
+def csv_rows_by_course_id(bind):
+    """{course id: CSV row} for every course that matches a row unambiguously; empty when the file is missing
+
+    Courses and rows are matched on (title, level, duration). Titles alone
+    are not unique in the CSV. When several courses share a key with as many rows,
+    they are paired in order, because import-courses inserts the rows in file
+    order. Keys with a different number of courses and rows are skipped.
+    """
+    if not os.path.exists(CSV_FILE_PATH):
+        return {}
+    with open(CSV_FILE_PATH, newline='', encoding='utf-8-sig') as csvfile:
+        rows_by_key = {}
+        for row in csv.DictReader(csvfile, delimiter=';'):
+            rows_by_key.setdefault(_key(row['Titel'], row['Niveau'], row['Tijdsinvestering']), []).append(row)
+
+    courses = sa.table(
+        'courses',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('level', sa.String),
+        sa.column('duration', sa.String),
+    )
+    ids_by_key = {}
+    for id_, title, level, duration in bind.execute(
+        sa.select(courses.c.id, courses.c.title, courses.c.level, courses.c.duration).order_by(courses.c.id)
+    ):
+        ids_by_key.setdefault(_key(title, level, duration), []).append(id_)
+
+    matches = {}
+    for key, ids in ids_by_key.items():
+        rows = rows_by_key.get(key, [])
+        if len(rows) == len(ids):
+            matches.update(zip(ids, rows))
+    return matches
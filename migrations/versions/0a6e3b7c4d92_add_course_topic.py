@@ -0,0 +1,37 @@
+"""add course topic
+
+Revision ID: 0a6e3b7c4d92
+Revises: f29c6d0b8e53
+Create Date: 2026-10-19 18:05:36.551820
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.elearnings_csv import csv_rows_by_course_id
+
+
+# revision identifiers, used by Alembic.
+revision = '0a6e3b7c4d92'
+down_revision = 'f29c6d0b8e53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('topic', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_courses_topic'), ['topic'], unique=False)
+
+    # Fill in the topic of existing courses from their CSV row
+    courses = sa.table('courses', sa.column('id', sa.Integer), sa.column('topic', sa.String))
+    for course_id, row in csv_rows_by_course_id(op.get_bind()).items():
+        topic = row['Onderwerp'].strip()
+        if topic:
+            op.execute(courses.update().where(courses.c.id == course_id).values(topic=topic))
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_courses_topic'))
+        batch_op.drop_column('topic')
@@ -0,0 +1,30 @@
+"""add catalog_version
+
+Revision ID: 4b7e2c9d1f30
+Revises: a28e3da1d386
+Create Date: 2026-10-19 09:12:31.482113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c9d1f30'
+down_revision = 'a28e3da1d386'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+
+
+def downgrade():
+    op.drop_table('catalog_version')
@@ -0,0 +1,127 @@
+"""add typed course facets
+
+Revision ID: 7d3a91e5c2b8
+Revises: 4b7e2c9d1f30
+Create Date: 2026-10-19 11:40:07.913554
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.elearnings_csv import csv_rows_by_course_id
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3a91e5c2b8'
+down_revision = '4b7e2c9d1f30'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ('duration_hours', sa.Float()),
+    ('level_number', sa.Integer()),
+    ('course_type', sa.String(length=50)),
+    ('language', sa.String(length=50)),
+    ('provider', sa.String(length=50)),
+    ('organization', sa.String(length=100)),
+    ('cost_type', sa.String(length=50)),
+]
+
+
+# Frozen copies of the parsers in src/course_attributes.py as of this revision,
+# so later changes to the app code don't change what this migration does
+HOURS_PER_UNIT = {
+    "u": 1, "uur": 1, "uren": 1, "h": 1, "hour": 1, "hours": 1,
+    "dag": 8, "dagen": 8, "day": 8, "days": 8,
+    "week": 4, "weken": 4, "weeks": 4,
+    "maand": 16, "maanden": 16, "month": 16, "months": 16,
+}
+LEVEL_NAMES = {
+    "beginner": 1, "basis": 1, "instap": 1,
+    "intermediate": 2, "gemiddeld": 2, "midden": 2,
+    "advanced": 3, "gevorderd": 3, "expert": 3,
+}
+CANONICAL_VALUES = {
+    "course_type": {"e-learning": "E-learning", "elearning": "E-learning", "ebook": "E-book", "e-book": "E-book"},
+    "language": {"engels": "Engels", "english": "Engels", "nederlands": "Nederlands", "dutch": "Nederlands"},
+    "cost_type": {"abbonement": "Abonnement", "abonnement": "Abonnement"},
+}
+CSV_COLUMNS = {
+    "course_type": "Type",
+    "language": "Taal",
+    "provider": "Aanbieder",
+    "organization": "Organisatie",
+    "cost_type": "Kosten",
+}
+_DURATION_RE = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*([a-z]*)\s*$")
+
+
+def parse_duration_hours(value):
+    if not value:
+        return None
+    match = _DURATION_RE.match(str(value).casefold())
+    if not match:
+        return None
+    amount, unit = match.groups()
+    hours_per_unit = HOURS_PER_UNIT.get(unit or "uur")
+    if hours_per_unit is None:
+        return None
+    return float(amount.replace(",", ".")) * hours_per_unit
+
+
+def parse_level(value):
+    if value is None:
+        return None
+    value = str(value).strip().casefold()
+    if value.isdigit():
+        return int(value)
+    return LEVEL_NAMES.get(value)
+
+
+def normalize_label(facet, value):
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    if not value:
+        return None
+    return CANONICAL_VALUES.get(facet, {}).get(value.casefold(), value)
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        for name, type_ in COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_courses_{name}'), [name], unique=False)
+
+    # Backfill duration_hours/level_number from the existing free text values,
+    # and the labels from the matching CSV row
+    courses = sa.table(
+        'courses',
+        sa.column('id', sa.Integer),
+        sa.column('duration', sa.String),
+        sa.column('level', sa.String),
+        *(sa.column(name, type_) for name, type_ in COLUMNS),
+    )
+    bind = op.get_bind()
+    csv_rows = csv_rows_by_course_id(bind)
+    rows = bind.execute(sa.select(courses.c.id, courses.c.duration, courses.c.level)).all()
+    for id_, duration, level in rows:
+        csv_row = csv_rows.get(id_, {})
+        bind.execute(
+            courses.update()
+            .where(courses.c.id == id_)
+            .values(
+                duration_hours=parse_duration_hours(duration),
+                level_number=parse_level(level),
+                **{facet: normalize_label(facet, csv_row.get(column)) for facet, column in CSV_COLUMNS.items()}
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_index(batch_op.f(f'ix_courses_{name}'))
+            batch_op.drop_column(name)
@@ -0,0 +1,47 @@
+"""add course link health
+
+Revision ID: c5f08a2e6d14
+Revises: 7d3a91e5c2b8
+Create Date: 2026-10-19 13:58:44.270391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.elearnings_csv import csv_rows_by_course_id
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f08a2e6d14'
+down_revision = '7d3a91e5c2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('link', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('link_status', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('link_final_url', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('link_checked_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('link_failures', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('link_deactivated', sa.Boolean(), nullable=False, server_default='0'))
+        batch_op.create_index(batch_op.f('ix_courses_link_checked_at'), ['link_checked_at'], unique=False)
+
+    # Fill in the link of existing courses from their CSV row
+    courses = sa.table('courses', sa.column('id', sa.Integer), sa.column('link', sa.String))
+    for course_id, row in csv_rows_by_course_id(op.get_bind()).items():
+        link = row['Link'].strip()
+        if link:
+            op.execute(courses.update().where(courses.c.id == course_id).values(link=link))
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_courses_link_checked_at'))
+        batch_op.drop_column('link_deactivated')
+        batch_op.drop_column('link_failures')
+        batch_op.drop_column('link_checked_at')
+        batch_op.drop_column('link_final_url')
+        batch_op.drop_column('link_status')
+        batch_op.drop_column('link')
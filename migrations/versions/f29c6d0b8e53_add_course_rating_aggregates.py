@@ -0,0 +1,38 @@
+"""add course rating aggregates
+
+Revision ID: f29c6d0b8e53
+Revises: e81b4f6a9c27
+Create Date: 2026-10-19 16:47:52.108349
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f29c6d0b8e53'
+down_revision = 'e81b4f6a9c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('enrollment_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Fill the aggregates from the enrollments that already exist
+    op.execute("""
+        UPDATE courses SET
+            rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM enrollments WHERE enrollments.course_id = courses.id),
+            rating_count = (SELECT COUNT(rating) FROM enrollments WHERE enrollments.course_id = courses.id),
+            enrollment_count = (SELECT COUNT(*) FROM enrollments WHERE enrollments.course_id = courses.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('enrollment_count')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
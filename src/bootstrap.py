@@ -0,0 +1,36 @@
+import os
+
+from flask import Flask
+
+from src.models import db
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Database configuration shared by the web app and the CLI scripts
+SQLALCHEMY_DATABASE_URI = "sqlite:///your_database.db"  # Change this to your database URI
+
+
+def configure_db(app):
+    """Apply the database settings and bind the shared SQLAlchemy instance to app"""
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", SQLALCHEMY_DATABASE_URI)
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+
+
+def create_db_app():
+    """Minimal app for scripts and CLI jobs: database engine and session only
+
+    No CSRF, no migrations and no routes are set up, so importing this is much
+    cheaper than `from app import app`. Use it as
+    `flask --app "src.bootstrap:create_db_app()" <command>`.
+    """
+    from src.commands import register_commands
+
+    app = Flask(
+        "app",
+        root_path=PROJECT_ROOT,
+        instance_path=os.path.join(PROJECT_ROOT, "instance"),
+    )
+    configure_db(app)
+    register_commands(app)
+    return app
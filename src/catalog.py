@@ -0,0 +1,204 @@
+import sys
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from src.models import db, Course, Tag, CatalogVersion
+
+# How often (in seconds) a worker asks the database whether the catalogue changed
+DEFAULT_VERSION_CHECK_INTERVAL = 2.0
+# How often (in seconds) a worker reloads the rating/enrollment aggregates
+DEFAULT_STATS_REFRESH_INTERVAL = 60.0
+
+
+# Course columns copied into each CourseRecord, in constructor order
+COURSE_COLUMNS = (
+    "id", "title", "description", "duration", "status", "tags", "level",
+    "topic", "duration_hours", "level_number", "course_type", "language", "provider", "organization", "cost_type",
+)
+# Low-cardinality labels; interning makes equal values share one string
+_INTERNED_COLUMNS = ("status", "topic", "course_type", "language", "provider", "organization", "cost_type")
+
+
+class CourseRecord:
+    """Read-only, compact copy of a Course row"""
+
+    __slots__ = COURSE_COLUMNS + ("tag_list", "tag_words")
+
+    def __init__(self, *values):
+        for name, value in zip(COURSE_COLUMNS, values):
+            if name in _INTERNED_COLUMNS and value is not None:
+                value = sys.intern(value)
+            setattr(self, name, value)
+        self.tags = self.tags or ""
+        # Same split as Course.tag_list, but interned so equal tags share one string
+        self.tag_list = tuple(sys.intern(tag.strip()) for tag in self.tags.split(",")) if self.tags else ()
+        # Tags as they are entered and collected (space separated, see collect_tags)
+        self.tag_words = tuple(sys.intern(tag) for tag in self.tags.split())
+
+    def __repr__(self):
+        return f"<CourseRecord(id={self.id}, title='{self.title}')>"
+
+
+class TagRecord:
+    """Read-only, compact copy of a Tag row"""
+
+    __slots__ = ("id", "tag_name")
+
+    def __init__(self, id, tag_name):
+        self.id = id
+        self.tag_name = sys.intern(tag_name)
+
+    def __repr__(self):
+        return f"<TagRecord(tag_name='{self.tag_name}')>"
+
+
+class CatalogSnapshot:
+    """Immutable view of the whole catalogue at a given catalog_version"""
+
+    __slots__ = ("version", "courses", "active_courses", "tags", "courses_by_id", "facet_cache")
+
+    def __init__(self, version, courses, tags):
+        self.version = version
+        self.courses = tuple(courses)
+        self.active_courses = tuple(course for course in self.courses if course.status == "active")
+        self.tags = tuple(tags)
+        self.courses_by_id = {course.id: course for course in self.courses}
+        # Facet results for this version only; dropped together with the snapshot
+        self.facet_cache = {}
+
+
+class CourseStats:
+    """Rating and enrollment aggregates of one course"""
+
+    __slots__ = ("rating_sum", "rating_count", "enrollment_count")
+
+    def __init__(self, rating_sum=0, rating_count=0, enrollment_count=0):
+        self.rating_sum = rating_sum
+        self.rating_count = rating_count
+        self.enrollment_count = enrollment_count
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+
+NO_STATS = CourseStats()
+
+
+class CourseStatsTable(dict):
+    """Course id -> CourseStats; courses without enrollments get NO_STATS"""
+
+    def __missing__(self, course_id):
+        return NO_STATS
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+_stats = None
+_stats_loaded_at = 0.0
+
+
+def _current_version():
+    version = db.session.execute(select(CatalogVersion.version).limit(1)).scalar()
+    return version or 0
+
+
+def _load_snapshot(version):
+    # Plain column selects: rows come back as tuples, nothing enters the identity map
+    course_rows = db.session.execute(
+        select(*(getattr(Course, name) for name in COURSE_COLUMNS)).order_by(Course.id)
+    )
+    tag_rows = db.session.execute(select(Tag.id, Tag.tag_name).order_by(Tag.id))
+    return CatalogSnapshot(
+        version,
+        [CourseRecord(*row) for row in course_rows],
+        [TagRecord(*row) for row in tag_rows],
+    )
+
+
+def get_catalog():
+    """Return the catalogue snapshot for this worker, reloading it when the version changed"""
+    global _snapshot, _checked_at
+
+    interval = current_app.config.get("CATALOG_VERSION_CHECK_INTERVAL", DEFAULT_VERSION_CHECK_INTERVAL)
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < interval:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and time.monotonic() - _checked_at < interval:
+            return snapshot
+        version = _current_version()
+        if snapshot is None or snapshot.version != version:
+            snapshot = _load_snapshot(version)
+            _snapshot = snapshot  # Atomic swap; readers keep whatever reference they already hold
+        _checked_at = time.monotonic()
+        return snapshot
+
+
+def invalidate_catalog():
+    """Force the next get_catalog() call in this worker to re-check the version"""
+    global _checked_at
+    _checked_at = 0.0
+
+
+def get_course_stats():
+    """Rating and enrollment aggregates, reloaded at most every STATS_REFRESH_INTERVAL seconds
+
+    Kept apart from the catalogue snapshot on purpose: ratings change far more
+    often than courses, and shouldn't make every worker rebuild the snapshot,
+    suggest index and learning paths.
+    """
+    global _stats, _stats_loaded_at
+
+    interval = current_app.config.get("STATS_REFRESH_INTERVAL", DEFAULT_STATS_REFRESH_INTERVAL)
+    stats = _stats
+    if stats is not None and time.monotonic() - _stats_loaded_at < interval:
+        return stats
+    rows = db.session.execute(
+        select(Course.id, Course.rating_sum, Course.rating_count, Course.enrollment_count)
+        .where(Course.enrollment_count > 0)
+    )
+    stats = CourseStatsTable((course_id, CourseStats(*values)) for course_id, *values in rows)
+    _stats, _stats_loaded_at = stats, time.monotonic()
+    return stats
+
+
+def invalidate_course_stats():
+    """Force the next get_course_stats() call in this worker to reload"""
+    global _stats_loaded_at
+    _stats_loaded_at = 0.0
+
+
+def bump_catalog_version(session=None):
+    """Increment catalog_version as part of the session's current transaction
+
+    Call this from every code path that writes courses or tags. The local
+    snapshot is invalidated once the transaction commits.
+    """
+    session = session or db.session
+    result = session.execute(update(CatalogVersion).values(version=CatalogVersion.version + 1))
+    if result.rowcount == 0:
+        session.add(CatalogVersion(version=1))
+    session.info["catalog_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("catalog_dirty", False):
+        invalidate_catalog()
+    if session.info.pop("course_stats_dirty", False):
+        invalidate_course_stats()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("catalog_dirty", None)
+    session.info.pop("course_stats_dirty", None)
@@ -0,0 +1,197 @@
+import csv
+
+import click
+
+from src.models import db, Course, User
+from src.catalog import bump_catalog_version
+from src.course_attributes import apply_course_attributes, attributes_from_csv_row
+
+# Path to the CSV file
+CSV_FILE_PATH = "data/Elearnings.csv"
+
+# Sample course data
+SAMPLE_COURSES = [
+    {
+        "title": "Machine Learning Basics",
+        "description": "Leer de fundamenten van machine learning en data science. Perfect voor beginners die willen starten met AI en data analyse.",
+        "duration": "8 weken",
+        "level": "Beginner",
+        "status": "active"
+    },
+    {
+        "title": "Python voor Data Analyse",
+        "description": "Masterclass in data-analyse met Python en pandas. Leer hoe je data kunt verwerken, analyseren en visualiseren.",
+        "duration": "6 weken",
+        "level": "Intermediate",
+        "status": "active"
+    },
+    {
+        "title": "Deep Learning Advanced",
+        "description": "Geavanceerde neural networks en AI-implementaties. Voor ervaren developers die zich willen specialiseren in deep learning.",
+        "duration": "10 weken",
+        "level": "Advanced",
+        "status": "active"
+    }
+]
+
+
+def setup_database():
+    # Create all tables
+    db.create_all()
+
+    # Check if the admin user already exists
+    admin_user = User.query.filter_by(username='admin').first()
+    if not admin_user:
+        # Create an admin user
+        admin_user = User(username='admin', email='admin@example.com', tags='admin')
+        admin_user.set_password('admin')  # Set the password to 'admin'
+        db.session.add(admin_user)
+        db.session.commit()
+        print("Admin user created successfully.")
+    else:
+        print("Admin user already exists.")
+
+    print("Database and tables created successfully.")
+
+
+def show_courses():
+    # Query all courses
+    courses = Course.query.all()
+
+    # Check if any courses were found
+    if not courses:
+        print("No courses found in the database.")
+    else:
+        print(f"Found {len(courses)} course(s):")
+        for course in courses:
+            print(f"ID: {course.id}, Title: {course.title}, Description: {course.description}, Duration: {course.duration}, Level: {course.level}, Status: {course.status}")
+
+
+def add_sample_courses():
+    # Clear existing courses (optional)
+    db.session.query(Course).delete()
+
+    # Add new courses
+    for course_data in SAMPLE_COURSES:
+        course = Course(**course_data)
+        apply_course_attributes(course, duration=course.duration, level=course.level)
+        db.session.add(course)
+
+    bump_catalog_version()
+    db.session.commit()  # Commit the changes to the database
+    print("Courses added to the database!")
+
+
+def import_courses_from_csv(csv_file_path=CSV_FILE_PATH):
+    # Clear existing courses
+    db.session.query(Course).delete()
+
+    # Open the CSV file and read its contents
+    with open(csv_file_path, newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.DictReader(csvfile, delimiter=';')  # Use ';' as the delimiter
+        for row in reader:
+            # Create a new Course instance from the CSV row
+            course = Course(
+                title=row['Titel'],
+                description=row['Beschrijving'],
+                duration=row['Tijdsinvestering'],
+                level=row['Niveau'],
+                link=row['Link'] or None,
+                status='active'  # Set status to 'active' by default
+            )
+            apply_course_attributes(
+                course,
+                duration=course.duration,
+                level=course.level,
+                **attributes_from_csv_row(row)
+            )
+            db.session.add(course)  # Add the course to the session
+
+    bump_catalog_version()
+    db.session.commit()  # Commit the changes to the database
+    print("Existing courses deleted and new courses imported from CSV to the database!")
+
+
+@click.command("setup-db")
+def setup_db_command():
+    """Create all tables and the admin user."""
+    setup_database()
+
+
+@click.command("show-courses")
+def show_courses_command():
+    """List all courses in the database."""
+    show_courses()
+
+
+@click.command("add-courses")
+def add_courses_command():
+    """Replace all courses with the sample courses."""
+    add_sample_courses()
+
+
+@click.command("import-courses")
+@click.option("--csv", "csv_file_path", default=CSV_FILE_PATH, show_default=True, help="Semicolon separated CSV file.")
+@click.confirmation_option(prompt="Are you sure? Going on will change the courses known in the database.")
+def import_courses_command(csv_file_path):
+    """Replace all courses with the ones in the CSV file."""
+    import_courses_from_csv(csv_file_path)
+
+
+@click.command("check-links")
+@click.option("--max-age-hours", type=float, default=7 * 24, show_default=True, help="Only re-check links checked longer ago than this.")
+@click.option("--deactivate", is_flag=True, help="Mark courses with dead links inactive, and reactivate them once the link works again.")
+@click.option("--concurrency", type=int, help="Maximum open connections.")
+@click.option("--per-host", type=int, help="Maximum open connections per host.")
+def check_links_command(max_age_hours, deactivate, concurrency, per_host):
+    """Check the external course links that are due for a check."""
+    from datetime import timedelta
+    from src.link_checker import run_link_check
+
+    limits = {}
+    if concurrency:
+        limits["max_connections"] = concurrency
+    if per_host:
+        limits["max_per_host"] = per_host
+    results, deactivated, reactivated = run_link_check(timedelta(hours=max_age_hours), deactivate=deactivate, **limits)
+    broken = [result for result in results if not result.is_ok]
+    click.echo(f"Checked {len(results)} link(s), {len(broken)} broken.")
+    for result in broken:
+        click.echo(f"    course {result.course_id}: {result.status or result.error} {result.url}")
+    if deactivate:
+        click.echo(f"Deactivated: {deactivated or 'none'}, reactivated: {reactivated or 'none'}")
+
+
+@click.command("check-import-time")
+@click.option("--module", "modules", multiple=True, help="Module to measure (default: all budgeted modules).")
+@click.option("--budget-ms", type=float, help="Override the budget for every measured module.")
+def check_import_time_command(modules, budget_ms):
+    """Fail when cold-importing a module takes longer than its budget."""
+    from src.import_budget import DEFAULT_BUDGETS_MS, measure_import, module_ms, slowest
+
+    over_budget = False
+    for module in modules or DEFAULT_BUDGETS_MS:
+        budget = budget_ms if budget_ms is not None else DEFAULT_BUDGETS_MS.get(module)
+        entries = measure_import(module)
+        elapsed = module_ms(entries, module)
+        status = "ok" if budget is None or elapsed <= budget else "OVER BUDGET"
+        click.echo(f"{module}: {elapsed:.0f} ms (budget {budget} ms) {status}")
+        if status != "ok":
+            over_budget = True
+            for name, _, cumulative, _ in slowest(entries, module, limit=5):
+                click.echo(f"    {name}: {cumulative / 1000:.0f} ms")
+    if over_budget:
+        raise click.exceptions.Exit(1)
+
+
+def register_commands(app):
+    """Register the maintenance commands on a Flask app's `flask` CLI"""
+    for command in (
+        setup_db_command,
+        show_courses_command,
+        add_courses_command,
+        import_courses_command,
+        check_links_command,
+        check_import_time_command,
+    ):
+        app.cli.add_command(command)
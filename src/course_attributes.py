@@ -0,0 +1,86 @@
+import re
+
+# Study hours assumed per unit when a duration is given as e.g. "8 weken"
+HOURS_PER_UNIT = {
+    "u": 1, "uur": 1, "uren": 1, "h": 1, "hour": 1, "hours": 1,
+    "dag": 8, "dagen": 8, "day": 8, "days": 8,
+    "week": 4, "weken": 4, "weeks": 4,
+    "maand": 16, "maanden": 16, "month": 16, "months": 16,
+}
+
+LEVEL_NAMES = {
+    "beginner": 1, "basis": 1, "instap": 1,
+    "intermediate": 2, "gemiddeld": 2, "midden": 2,
+    "advanced": 3, "gevorderd": 3, "expert": 3,
+}
+
+# Canonical spelling per facet, keyed by the casefolded raw value
+CANONICAL_VALUES = {
+    "topic": {},
+    "course_type": {"e-learning": "E-learning", "elearning": "E-learning", "ebook": "E-book", "e-book": "E-book"},
+    "language": {"engels": "Engels", "english": "Engels", "nederlands": "Nederlands", "dutch": "Nederlands"},
+    "provider": {},
+    "organization": {},
+    "cost_type": {"abbonement": "Abonnement", "abonnement": "Abonnement"},
+}
+
+# Columns in data/Elearnings.csv for each typed attribute
+CSV_COLUMNS = {
+    "topic": "Onderwerp",
+    "course_type": "Type",
+    "language": "Taal",
+    "provider": "Aanbieder",
+    "organization": "Organisatie",
+    "cost_type": "Kosten",
+}
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*([a-z]*)\s*$")
+
+
+def parse_duration_hours(value):
+    """Turn "12", "1,5 uur" or "8 weken" into hours; None when it can't be parsed"""
+    if not value:
+        return None
+    match = _DURATION_RE.match(str(value).casefold())
+    if not match:
+        return None
+    amount, unit = match.groups()
+    hours_per_unit = HOURS_PER_UNIT.get(unit or "uur")
+    if hours_per_unit is None:
+        return None
+    return float(amount.replace(",", ".")) * hours_per_unit
+
+
+def parse_level(value):
+    """Turn "1"/"2"/"3" or "Beginner"/"Intermediate"/"Advanced" into 1-3; None when unknown"""
+    if value is None:
+        return None
+    value = str(value).strip().casefold()
+    if value.isdigit():
+        return int(value)
+    return LEVEL_NAMES.get(value)
+
+
+def normalize_label(facet, value):
+    """Strip stray whitespace and unify spelling variants of a facet value"""
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    if not value:
+        return None
+    return CANONICAL_VALUES.get(facet, {}).get(value.casefold(), value)
+
+
+def apply_course_attributes(course, duration=None, level=None, **labels):
+    """Set the typed columns of course from raw (free text) values"""
+    if duration is not None:
+        course.duration_hours = parse_duration_hours(duration)
+    if level is not None:
+        course.level_number = parse_level(level)
+    for facet, value in labels.items():
+        setattr(course, facet, normalize_label(facet, value))
+
+
+def attributes_from_csv_row(row):
+    """Typed attribute values for a row of data/Elearnings.csv"""
+    return {facet: row.get(column) for facet, column in CSV_COLUMNS.items()}
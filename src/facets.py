@@ -0,0 +1,83 @@
+# Query parameter -> CourseRecord attribute for every facet
+FACETS = {
+    "level": "level_number",
+    "type": "course_type",
+    "language": "language",
+    "provider": "provider",
+    "organization": "organization",
+    "cost": "cost_type",
+    "duration": "duration_hours",
+}
+
+# Tijdsinvestering is bucketed: (label, lower bound inclusive, upper bound exclusive) in hours
+DURATION_BUCKETS = (
+    ("<2", 0, 2),
+    ("2-5", 2, 5),
+    ("5-20", 5, 20),
+    ("20+", 20, float("inf")),
+)
+
+# Distinct filter combinations kept per catalogue version
+MAX_CACHED_QUERIES = 256
+
+
+def duration_bucket(hours):
+    if hours is None:
+        return None
+    for label, lower, upper in DURATION_BUCKETS:
+        if lower <= hours < upper:
+            return label
+    return None
+
+
+def facet_value(course, facet):
+    value = getattr(course, FACETS[facet])
+    if facet == "duration":
+        return duration_bucket(value)
+    if facet == "level" and value is not None:
+        return str(value)
+    return value
+
+
+def parse_facet_filters(args):
+    """Selected values per facet from request args, e.g. ?level=1&level=2&language=Engels
+
+    Returned as a hashable, order independent key that doubles as cache key.
+    """
+    return tuple(
+        (facet, tuple(sorted(set(args.getlist(facet)))))
+        for facet in FACETS
+        if args.getlist(facet)
+    )
+
+
+def _compute(courses, filters):
+    selected = dict(filters)
+    results = []
+    counts = {facet: {} for facet in FACETS}
+
+    # One pass: a course counts towards a facet when it matches every *other*
+    # facet's filter, so each facet shows what selecting one of its values would give
+    for course in courses:
+        values = {facet: facet_value(course, facet) for facet in FACETS}
+        failed = [facet for facet, wanted in selected.items() if values[facet] not in wanted]
+        if len(failed) > 1:
+            continue
+        if not failed:
+            results.append(course)
+        for facet, value in values.items():
+            if value is None or (failed and facet != failed[0]):
+                continue
+            counts[facet][value] = counts[facet].get(value, 0) + 1
+
+    return results, counts
+
+
+def facet_search(catalog, filters):
+    """Active courses matching filters plus per-facet counts, cached on the catalogue snapshot"""
+    cached = catalog.facet_cache.get(filters)
+    if cached is None:
+        if len(catalog.facet_cache) >= MAX_CACHED_QUERIES:
+            catalog.facet_cache.clear()
+        cached = catalog.facet_cache[filters] = _compute(catalog.active_courses, filters)
+    return cached
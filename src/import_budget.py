@@ -0,0 +1,73 @@
+import subprocess
+import sys
+
+from src.bootstrap import PROJECT_ROOT
+
+# Cold-start budgets in milliseconds, measured with `python -X importtime`.
+# Measuring runs a bare import, so these modules must not touch the database
+# on import (app.py only does that under __main__).
+DEFAULT_BUDGETS_MS = {
+    "src.bootstrap": 500,
+    "app": 1000,
+}
+
+
+def parse_importtime(output):
+    """Parse `-X importtime` stderr into (module, self_us, cumulative_us, depth) tuples"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        # Nesting is shown as two spaces per level in front of the module name
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+
+def measure_import(module, cwd=PROJECT_ROOT):
+    """Import module in a fresh interpreter and return its importtime entries
+
+    Runs from the project root by default, so top-level modules like `app`
+    are importable wherever the command is started from. Whatever the
+    module does on import runs against the real configuration, database
+    included.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def _module_index(entries, module):
+    for index in range(len(entries) - 1, -1, -1):
+        name, _, _, depth = entries[index]
+        if depth == 0 and name == module:
+            return index
+    raise LookupError(f"{module} not found in importtime output")
+
+
+def module_ms(entries, module):
+    """Cumulative import time of module itself, in milliseconds"""
+    return entries[_module_index(entries, module)][2] / 1000
+
+
+def slowest(entries, module, limit=10):
+    """Direct dependencies of module that cost the most, slowest first"""
+    # importtime lists a module after its dependencies, so they sit between
+    # the previous top-level entry (interpreter startup) and the module itself
+    end = _module_index(entries, module)
+    start = end
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    children = [entry for entry in entries[start:end] if entry[3] == 1]
+    return sorted(children, key=lambda entry: entry[2], reverse=True)[:limit]
@@ -0,0 +1,136 @@
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import inspect, update
+
+from src.models import db, Job
+
+DEFAULT_WORKERS = 2
+# Minimum seconds between two progress writes of the same job
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# Job name -> function(progress, **params), filled by the @job decorator
+JOBS = {}
+
+
+def job(name):
+    """Register a function as a background job
+
+    The function is called inside an app context as fn(progress, **params),
+    where progress(fraction, message=None) reports how far along it is. Its
+    return value must be JSON serializable.
+    """
+    def decorator(fn):
+        JOBS[name] = fn
+        return fn
+    return decorator
+
+
+class JobRunner:
+    """Runs registered jobs on a thread pool and records their state in the jobs table"""
+
+    def __init__(self, app, max_workers=DEFAULT_WORKERS):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def enqueue(self, name, **params):
+        """Store a queued job and hand it to the pool; returns the new Job id"""
+        if name not in JOBS:
+            raise KeyError(f"Unknown job: {name}")
+        new_job = Job(name=name, params=json.dumps(params), status="queued", progress=0.0)
+        db.session.add(new_job)
+        db.session.commit()
+        self.executor.submit(self._run, new_job.id, name, params)
+        return new_job.id
+
+    def _write(self, job_id, **values):
+        # Own connection and transaction, so the job's session is never committed halfway
+        with db.engine.begin() as connection:
+            connection.execute(update(Job).where(Job.id == job_id).values(**values))
+
+    def _run(self, job_id, name, params):
+        with self.app.app_context():
+            self._write(job_id, status="running", started_at=datetime.utcnow())
+            last_write = 0.0
+
+            def progress(fraction, message=None):
+                nonlocal last_write
+                now = time.monotonic()
+                if now - last_write < PROGRESS_WRITE_INTERVAL and fraction < 1:
+                    return
+                last_write = now
+                values = {"progress": max(0.0, min(1.0, fraction))}
+                if message is not None:
+                    values["message"] = message[:255]
+                try:
+                    self._write(job_id, **values)
+                except Exception:
+                    # Progress is best effort; the job itself may hold the SQLite write lock
+                    pass
+
+            try:
+                result = JOBS[name](progress, **params)
+            except Exception as e:
+                db.session.rollback()
+                self._write(
+                    job_id,
+                    status="failed",
+                    error=f"{e}\n{traceback.format_exc()}",
+                    finished_at=datetime.utcnow(),
+                )
+            else:
+                self._write(
+                    job_id,
+                    status="succeeded",
+                    progress=1.0,
+                    result=json.dumps(result),
+                    finished_at=datetime.utcnow(),
+                )
+            finally:
+                db.session.remove()
+
+
+def fail_interrupted_jobs():
+    """Mark jobs still queued or running from a previous process as failed
+
+    The pool lives in-process, so those jobs will never finish. Call this
+    only from the process that serves requests and runs the jobs, when it
+    starts (see app.py); never on import, or CLI commands would fail the
+    jobs of a running server.
+    """
+    if not inspect(db.engine).has_table(Job.__tablename__):
+        return 0  # Not migrated yet, e.g. while running `flask db upgrade`
+    with db.engine.begin() as connection:
+        result = connection.execute(
+            update(Job)
+            .where(Job.status.in_(("queued", "running")))
+            .values(status="failed", error="Interrupted by a restart.", finished_at=datetime.utcnow())
+        )
+    return result.rowcount
+
+
+def init_jobs(app):
+    """Attach a JobRunner to app (app.extensions["jobs"])"""
+    runner = JobRunner(app, max_workers=app.config.get("JOB_WORKERS", DEFAULT_WORKERS))
+    app.extensions["jobs"] = runner
+    return runner
+
+
+def job_to_dict(job_row, details=True):
+    """JSON view of a job; params and error (a traceback) only with details"""
+    return {
+        "id": job_row.id,
+        "name": job_row.name,
+        "params": (json.loads(job_row.params) if job_row.params else {}) if details else None,
+        "status": job_row.status,
+        "progress": job_row.progress,
+        "message": job_row.message,
+        "result": json.loads(job_row.result) if job_row.result else None,
+        "error": job_row.error if details else None,
+        "created_at": job_row.created_at.isoformat() if job_row.created_at else None,
+        "started_at": job_row.started_at.isoformat() if job_row.started_at else None,
+        "finished_at": job_row.finished_at.isoformat() if job_row.finished_at else None,
+    }
@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+
+from src.models import db, Course
+from src.catalog import bump_catalog_version
+
+# Connection pool size, overall and per host
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 2
+
+REQUEST_TIMEOUT = 15  # seconds per attempt
+RETRIES = 2  # extra attempts after a connection error, timeout or retryable status
+RETRY_BACKOFF = 1.0  # seconds, doubled per attempt
+
+# Re-check links whose last check is older than this
+DEFAULT_MAX_AGE = timedelta(days=7)
+
+# Servers that don't implement HEAD (properly) answer with one of these
+HEAD_UNSUPPORTED_STATUSES = {403, 405, 501}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Only these count as a rotten link; 401/403 etc. usually mean "bots not welcome"
+DEAD_STATUSES = {404, 410}
+# Timeouts, connection errors and 5xx only deactivate a course after this many checks in a row
+FAILURES_BEFORE_DEACTIVATION = 3
+
+USER_AGENT = "courses-for-journalists link checker"
+
+
+class LinkResult:
+    """Outcome of checking a single link"""
+
+    __slots__ = ("course_id", "url", "status", "final_url", "error")
+
+    def __init__(self, course_id, url, status=None, final_url=None, error=None):
+        self.course_id = course_id
+        self.url = url
+        self.status = status
+        self.final_url = final_url
+        self.error = error
+
+    @property
+    def is_dead(self):
+        """The server says the page is not found or gone"""
+        return self.status in DEAD_STATUSES
+
+    @property
+    def is_failure(self):
+        """Unreachable after all retries or a server error; may well be temporary"""
+        return self.status is None or self.status >= 500
+
+    @property
+    def is_ok(self):
+        return not self.is_dead and not self.is_failure
+
+    def __repr__(self):
+        return f"<LinkResult(course_id={self.course_id}, status={self.status}, url='{self.url}')>"
+
+
+async def _request(session, method, url, timeout):
+    import aiohttp
+
+    async with session.request(
+        method, url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as response:
+        return response.status, str(response.url)
+
+
+async def check_link(session, course_id, url, timeout=REQUEST_TIMEOUT, retries=RETRIES, backoff=RETRY_BACKOFF):
+    """HEAD the url (falling back to GET), retrying transient failures"""
+    import aiohttp
+
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            status, final_url = await _request(session, "HEAD", url, timeout)
+            if status in HEAD_UNSUPPORTED_STATUSES:
+                status, final_url = await _request(session, "GET", url, timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or e.__class__.__name__
+            continue
+        if status in RETRYABLE_STATUSES and attempt < retries:
+            continue
+        return LinkResult(course_id, url, status=status, final_url=final_url)
+    return LinkResult(course_id, url, error=error)
+
+
+async def check_links(links, max_connections=MAX_CONNECTIONS, max_per_host=MAX_CONNECTIONS_PER_HOST, **kwargs):
+    """Check (course_id, url) pairs concurrently within the connection limits"""
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_per_host)
+    async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}) as session:
+        return await asyncio.gather(
+            *(check_link(session, course_id, url, **kwargs) for course_id, url in links)
+        )
+
+
+def stale_links(max_age=DEFAULT_MAX_AGE, now=None):
+    """(course_id, url) of every course whose link was never checked or not since max_age"""
+    cutoff = (now or datetime.utcnow()) - max_age
+    return db.session.execute(
+        select(Course.id, Course.link)
+        .where(Course.link.isnot(None), Course.link != "")
+        .where(or_(Course.link_checked_at.is_(None), Course.link_checked_at < cutoff))
+        .order_by(Course.id)
+    ).all()
+
+
+def save_results(results, deactivate=False, now=None, max_failures=FAILURES_BEFORE_DEACTIVATION):
+    """Store the outcome per course; optionally (de)activate courses based on their link
+
+    With deactivate, a course goes inactive on a 404/410 or after max_failures
+    failed checks in a row, and a course the checker deactivated earlier is
+    made active again once its link works. Courses set inactive by hand are
+    never touched.
+    """
+    now = now or datetime.utcnow()
+    for result in results:
+        failures = 0 if result.is_ok else Course.link_failures + 1
+        db.session.execute(
+            update(Course)
+            .where(Course.id == result.course_id)
+            .values(
+                link_status=result.status,
+                link_final_url=result.final_url,
+                link_checked_at=now,
+                link_failures=failures,
+            )
+        )
+
+    if not deactivate:
+        db.session.commit()
+        return [], []
+
+    dead_ids = [result.course_id for result in results if result.is_dead]
+    failed_ids = [result.course_id for result in results if result.is_failure]
+    ok_ids = [result.course_id for result in results if result.is_ok]
+    deactivated = db.session.execute(
+        select(Course.id).where(
+            or_(Course.id.in_(dead_ids), and_(Course.id.in_(failed_ids), Course.link_failures >= max_failures)),
+            Course.status == "active",
+        )
+    ).scalars().all()
+    reactivated = db.session.execute(
+        select(Course.id).where(Course.id.in_(ok_ids), Course.link_deactivated.is_(True))
+    ).scalars().all()
+    if deactivated:
+        db.session.execute(
+            update(Course).where(Course.id.in_(deactivated)).values(status="inactive", link_deactivated=True)
+        )
+    if reactivated:
+        db.session.execute(
+            update(Course).where(Course.id.in_(reactivated)).values(status="active", link_deactivated=False)
+        )
+    if deactivated or reactivated:
+        bump_catalog_version()
+    db.session.commit()
+    return deactivated, reactivated
+
+
+def run_link_check(max_age=DEFAULT_MAX_AGE, deactivate=False, **kwargs):
+    """Check all stale course links and store the results
+
+    Returns (results, deactivated course ids, reactivated course ids).
+    """
+    links = stale_links(max_age)
+    if not links:
+        return [], [], []
+    results = asyncio.run(check_links(links, **kwargs))
+    deactivated, reactivated = save_results(results, deactivate=deactivate)
+    return results, deactivated, reactivated
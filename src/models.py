@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import object_session
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask_migrate import Migrate
 
 db = SQLAlchemy()
 
@@ -14,6 +15,27 @@ class Course(db.Model):
     status = db.Column(db.String(20), default='active')  # 'active' or 'inactive'
     tags = db.Column(db.String(255), default='')
     level = db.Column(db.String(50), nullable=True)  # Add this temporarily
+    # Typed, indexed facets (see src/course_attributes.py for the parsers)
+    topic = db.Column(db.String(20), nullable=True, index=True)  # Quiz topic: 'MLAI', 'DACL', 'AIETHIC', 'GENAI', ...
+    duration_hours = db.Column(db.Float, nullable=True, index=True)
+    level_number = db.Column(db.Integer, nullable=True, index=True)
+    course_type = db.Column(db.String(50), nullable=True, index=True)
+    language = db.Column(db.String(50), nullable=True, index=True)
+    provider = db.Column(db.String(50), nullable=True, index=True)
+    organization = db.Column(db.String(100), nullable=True, index=True)
+    cost_type = db.Column(db.String(50), nullable=True, index=True)
+    # External course page and the outcome of the last link check (see src/link_checker.py)
+    link = db.Column(db.String(500), nullable=True)
+    link_status = db.Column(db.Integer, nullable=True)  # HTTP status, None when unreachable
+    link_final_url = db.Column(db.String(500), nullable=True)
+    link_checked_at = db.Column(db.DateTime, nullable=True, index=True)
+    link_failures = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Consecutive failed checks
+    link_deactivated = db.Column(db.Boolean, nullable=False, default=False, server_default='0')  # Set inactive by the link checker
+    # Enrollment aggregates, kept up to date by the Enrollment events below.
+    # Not part of the catalogue snapshot; read them through src.catalog.get_course_stats()
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    enrollment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
@@ -22,6 +44,11 @@ class Course(db.Model):
         """Convert tags string to list"""
         return [tag.strip() for tag in self.tags.split(',')] if self.tags else []
 
+    @property
+    def average_rating(self):
+        """Mean enrollment rating, None when nobody rated the course yet"""
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -44,12 +71,61 @@ class Enrollment(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
-    rating = db.Column(db.Integer)  # e.g., 1 to 5
+    # active_history keeps the old values around, so the Course aggregates can be adjusted on update
+    course_id = db.mapped_column(db.Integer, db.ForeignKey('courses.id'), nullable=False, active_history=True)
+    rating = db.mapped_column(db.Integer, active_history=True)  # e.g., 1 to 5
     feedback = db.Column(db.Text)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+def _adjust_course_stats(connection, course_id, rating, sign):
+    """Add (sign=1) or remove (sign=-1) one enrollment and its rating from a course's aggregates"""
+    values = {"enrollment_count": Course.enrollment_count + sign}
+    if rating is not None:
+        values["rating_sum"] = Course.rating_sum + sign * rating
+        values["rating_count"] = Course.rating_count + sign
+    connection.execute(update(Course).where(Course.id == course_id).values(**values))
+
+
+def _stats_changed(target):
+    # Lets this worker reload its course stats right after the commit (see src/catalog.py)
+    session = object_session(target)
+    if session is not None:
+        session.info["course_stats_dirty"] = True
+
+
+@event.listens_for(Enrollment, "after_insert")
+def _enrollment_inserted(mapper, connection, target):
+    _adjust_course_stats(connection, target.course_id, target.rating, 1)
+    _stats_changed(target)
+
+
+@event.listens_for(Enrollment, "after_update")
+def _enrollment_updated(mapper, connection, target):
+    state = inspect(target)
+    course_history = state.attrs.course_id.history
+    rating_history = state.attrs.rating.history
+    if not course_history.has_changes() and not rating_history.has_changes():
+        return
+    old_course_id = course_history.deleted[0] if course_history.deleted else target.course_id
+    old_rating = rating_history.deleted[0] if rating_history.deleted else target.rating
+    _adjust_course_stats(connection, old_course_id, old_rating, -1)
+    _adjust_course_stats(connection, target.course_id, target.rating, 1)
+    _stats_changed(target)
+
+
+@event.listens_for(Enrollment, "after_delete")
+def _enrollment_deleted(mapper, connection, target):
+    old_course_id = inspect(target).attrs.course_id.history.deleted
+    old_rating = inspect(target).attrs.rating.history.deleted
+    _adjust_course_stats(
+        connection,
+        old_course_id[0] if old_course_id else target.course_id,
+        old_rating[0] if old_rating else target.rating,
+        -1,
+    )
+    _stats_changed(target)
+
 class UserResponse(db.Model):
     __tablename__ = 'user_responses'
     
@@ -68,3 +144,31 @@ class Tag(db.Model):
 
     def __repr__(self):
         return f"<Tag(tag_name='{self.tag_name}')>"
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f"<CatalogVersion(version={self.version})>"
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text)  # JSON encoded keyword arguments
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # 'queued', 'running', 'succeeded' or 'failed'
+    progress = db.Column(db.Float, nullable=False, default=0.0)  # 0.0 to 1.0
+    message = db.Column(db.String(255))
+    result = db.Column(db.Text)  # JSON encoded return value
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, name='{self.name}', status='{self.status}')>"
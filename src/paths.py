@@ -0,0 +1,109 @@
+import threading
+
+# Topics offered by the quiz in courses_page
+QUIZ_TOPICS = ("MLAI", "DACL", "AIETHIC", "GENAI")
+LEVELS = (1, 2, 3)
+
+
+def _sort_key(course, stats):
+    # Between courses of one level: most popular first, then alphabetical
+    course_stats = stats[course.id]
+    return (course.level_number, -course_stats.enrollment_count, -(course_stats.average_rating or 0), course.title)
+
+
+def build_topic_graph(courses):
+    """Progression DAG for the courses of one topic
+
+    Each course points to the courses on the next level present in the topic
+    that share at least one tag with it; the edge's "shared" attribute counts
+    those tags. A course sharing no tags with the next level points to all of
+    them, so no one gets stuck.
+    """
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    by_level = {}
+    for course in courses:
+        graph.add_node(course.id, course=course)
+        by_level.setdefault(course.level_number, []).append(course)
+
+    levels = sorted(by_level)
+    for level, next_level in zip(levels, levels[1:]):
+        for course in by_level[level]:
+            tags = set(course.tag_words)
+            shared = {other.id: len(tags.intersection(other.tag_words)) for other in by_level[next_level]}
+            followers = [other for other in by_level[next_level] if shared[other.id]]
+            for other in followers or by_level[next_level]:
+                graph.add_edge(course.id, other.id, shared=shared[other.id])
+    return graph
+
+
+def _ordered_path(graph, start_level, stats):
+    """Walk the DAG upwards from start_level, one course per level
+
+    Starts with the most popular course on the first level present, then each
+    time follows the successor sharing the most tags with the current course,
+    popularity breaking ties. The other successors are listed as alternatives.
+    """
+    courses = [data["course"] for _, data in graph.nodes(data=True) if data["course"].level_number >= start_level]
+    if not courses:
+        return []
+    first_level = min(course.level_number for course in courses)
+    candidates = [course for course in courses if course.level_number == first_level]
+
+    path = []
+    previous = None
+    while candidates:
+        def rank(course):
+            shared = graph.edges[previous.id, course.id]["shared"] if previous is not None else 0
+            return (-shared, *_sort_key(course, stats))
+
+        course = min(candidates, key=rank)
+        path.append({
+            "id": course.id,
+            "title": course.title,
+            "level": course.level_number,
+            "duration_hours": course.duration_hours,
+            "after": [previous.id] if previous is not None else [],
+            "alternatives": [other.id for other in sorted(candidates, key=rank) if other is not course],
+        })
+        previous = course
+        candidates = [graph.nodes[node]["course"] for node in graph.successors(course.id)]
+    return path
+
+
+def build_learning_paths(catalog, stats):
+    """Ordered path per (topic, starting level) for every topic in the catalogue"""
+    topics = {}
+    for course in catalog.active_courses:
+        if course.topic and course.level_number is not None:
+            topics.setdefault(course.topic, []).append(course)
+
+    paths = {}
+    for topic in set(topics) | set(QUIZ_TOPICS):
+        graph = build_topic_graph(topics.get(topic, []))
+        for level in LEVELS:
+            paths[(topic, level)] = _ordered_path(graph, level, stats)
+    return paths
+
+
+_paths = None  # (snapshot, paths)
+_lock = threading.Lock()
+
+
+def get_learning_paths(catalog, stats):
+    """Precomputed paths for this catalogue snapshot; rebuilt once per catalogue version
+
+    Popularity only picks between equally good courses, so it is taken from
+    stats as they are when the paths are built; rating changes alone don't
+    rebuild them.
+    """
+    global _paths
+
+    cached = _paths
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _lock:
+        if _paths is None or _paths[0] is not catalog:
+            _paths = (catalog, build_learning_paths(catalog, stats))
+        return _paths[1]
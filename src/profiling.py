@@ -0,0 +1,110 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+from flask import g, request, session
+
+# Defaults, override through app.config
+DEFAULT_SAMPLE_RATE = 0.0  # Fraction of requests to profile; 0 turns sampling off
+DEFAULT_MAX_FILES = 50  # Oldest profiles are removed beyond this
+PROFILE_HEADER = "X-Profile"  # Profiles this request when sent by a logged in admin
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+\.pstats$")
+# Names written by this module: <time_ns>_<endpoint>_<milliseconds>ms.pstats
+_GENERATED_NAME_RE = re.compile(r"^(\d{20})_(.+)_(\d+)ms\.pstats$")
+
+
+def profile_dir(app):
+    return app.config.get("PROFILE_DIR") or os.path.join(app.instance_path, "profiles")
+
+
+def _should_profile(app):
+    if request.headers.get(PROFILE_HEADER) and session.get("username") == "admin":
+        return True
+    rate = app.config.get("PROFILE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+    return rate > 0 and random.random() < rate
+
+
+def _trim(directory, max_files):
+    # The zero padded time_ns prefix sorts oldest first, regardless of time zone or DST
+    profiles = sorted(name for name in os.listdir(directory) if _GENERATED_NAME_RE.match(name))
+    for name in profiles[:-max(max_files, 1)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass  # Another worker got there first
+
+
+def init_profiling(app):
+    """Profile sampled (or admin-requested) requests with cProfile
+
+    Each profile is written to PROFILE_DIR as
+    <time_ns>_<endpoint>_<milliseconds>ms.pstats; only the newest
+    PROFILE_MAX_FILES are kept.
+    """
+
+    @app.before_request
+    def _start_profiler():
+        if not _should_profile(app):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return  # Another profiler is active in this interpreter
+        g._profiler = profiler
+        g._profile_started = time.perf_counter()
+
+    @app.teardown_request
+    def _stop_profiler(exc=None):
+        profiler = g.pop("_profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.pop("_profile_started")) * 1000
+
+        directory = profile_dir(app)
+        os.makedirs(directory, exist_ok=True)
+        endpoint = _UNSAFE_CHARS.sub("-", request.endpoint or "unknown")
+        name = f"{time.time_ns():020d}_{endpoint}_{elapsed_ms:.0f}ms.pstats"
+        profiler.dump_stats(os.path.join(directory, name))
+        _trim(directory, app.config.get("PROFILE_MAX_FILES", DEFAULT_MAX_FILES))
+
+
+def list_profiles(app):
+    """Stored profiles, newest first"""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        match = _GENERATED_NAME_RE.match(name)
+        if not match:
+            continue  # Not one of ours
+        created_ns, endpoint, elapsed_ms = match.groups()
+        try:
+            size = os.path.getsize(os.path.join(directory, name))
+        except FileNotFoundError:
+            continue  # Trimmed by another worker meanwhile
+        profiles.append({
+            "name": name,
+            "endpoint": endpoint,
+            "elapsed_ms": int(elapsed_ms),
+            "created_at": datetime.fromtimestamp(int(created_ns) / 1e9, tz=timezone.utc).isoformat(),
+            "size": size,
+        })
+    return profiles
+
+
+def profile_summary(path, sort="cumulative", limit=40):
+    """Plain text pstats report of the hottest functions in a stored profile"""
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
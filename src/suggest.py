@@ -0,0 +1,149 @@
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+from src.catalog import NO_STATS
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Title words shorter than this are not indexed on their own ("de", "en", "of", ...)
+MIN_TOKEN_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold(text):
+    """Case and accent folding for Dutch text: "Ëen Cursus" -> "een cursus", "ĳs" -> "ijs" """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _course_entries(course):
+    title = fold(course.title)
+    yield (title, "course", course.id)
+    for token in set(_TOKEN_RE.findall(title)):
+        if len(token) >= MIN_TOKEN_LENGTH and not title.startswith(token):
+            yield (token, "course", course.id)
+
+
+def _tag_entries(tag_name):
+    yield (fold(tag_name), "tag", tag_name)
+
+
+class SuggestIndex:
+    """Sorted (folded key, kind, ref) entries over titles, title words and tags of one catalogue version
+
+    Lookups bisect to the prefix range. Updates copy the list and apply only
+    the courses and tags that changed, so readers never see a half-updated index.
+    """
+
+    __slots__ = ("version", "snapshot", "entries", "tag_counts")
+
+    def __init__(self, snapshot, entries, tag_counts):
+        self.version = snapshot.version
+        self.snapshot = snapshot
+        self.entries = entries
+        self.tag_counts = tag_counts
+
+    @classmethod
+    def build(cls, snapshot):
+        entries = []
+        tag_counts = Counter()
+        for course in snapshot.active_courses:
+            entries.extend(_course_entries(course))
+            tag_counts.update(course.tag_words)
+        for tag in snapshot.tags:
+            entries.extend(_tag_entries(tag.tag_name))
+        entries.sort()
+        return cls(snapshot, entries, tag_counts)
+
+    def updated(self, snapshot):
+        """A new index for snapshot, derived from this one by applying only the differences"""
+        entries = list(self.entries)
+        tag_counts = Counter(self.tag_counts)
+
+        old_courses = {course.id: course for course in self.snapshot.active_courses}
+        new_courses = {course.id: course for course in snapshot.active_courses}
+        for course_id in old_courses.keys() | new_courses.keys():
+            old, new = old_courses.get(course_id), new_courses.get(course_id)
+            if old is not None and new is not None and old.title == new.title and old.tag_words == new.tag_words:
+                continue
+            if old is not None:
+                for entry in _course_entries(old):
+                    _remove(entries, entry)
+                tag_counts.subtract(old.tag_words)
+            if new is not None:
+                for entry in _course_entries(new):
+                    insort(entries, entry)
+                tag_counts.update(new.tag_words)
+
+        old_tags = {tag.tag_name for tag in self.snapshot.tags}
+        new_tags = {tag.tag_name for tag in snapshot.tags}
+        for tag_name in old_tags - new_tags:
+            for entry in _tag_entries(tag_name):
+                _remove(entries, entry)
+        for tag_name in new_tags - old_tags:
+            for entry in _tag_entries(tag_name):
+                insort(entries, entry)
+
+        return SuggestIndex(snapshot, entries, +tag_counts)
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT, stats=None):
+        """Top completions for prefix, most popular first
+
+        Course popularity comes from stats (course id -> CourseStats, see
+        src.catalog.get_course_stats); without it courses rank by length only.
+        """
+        prefix = fold(prefix.strip())
+        if not prefix:
+            return []
+        courses_by_id = self.snapshot.courses_by_id
+        candidates = {}
+        start = bisect_left(self.entries, (prefix,))
+        for key, kind, ref in self.entries[start:]:
+            if not key.startswith(prefix):
+                break
+            if (kind, ref) in candidates:
+                continue
+            if kind == "course":
+                course_stats = stats[ref] if stats is not None else NO_STATS
+                text = courses_by_id[ref].title
+                popularity = (course_stats.enrollment_count, course_stats.average_rating or 0)
+            else:
+                text, popularity = ref, (self.tag_counts[ref], 0)
+            candidates[(kind, ref)] = (popularity, -len(text), text, kind, ref)
+        best = heapq.nlargest(limit, candidates.values())
+        return [
+            {"text": text, "type": kind, "id": ref if kind == "course" else None}
+            for _, _, text, kind, ref in best
+        ]
+
+
+def _remove(entries, entry):
+    index = bisect_left(entries, entry)
+    if index < len(entries) and entries[index] == entry:
+        del entries[index]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_suggest_index(catalog):
+    """The index for this catalogue snapshot, updated incrementally from the previous one"""
+    global _index
+
+    index = _index
+    if index is not None and index.snapshot is catalog:
+        return index
+    with _lock:
+        index = _index
+        if index is None:
+            index = SuggestIndex.build(catalog)
+        elif index.snapshot is not catalog:
+            index = index.updated(catalog)
+        _index = index
+        return index
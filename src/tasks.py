@@ -0,0 +1,77 @@
+from sqlalchemy import func, select, update
+
+from src.models import db, Course, Enrollment, Tag
+from src.jobs import job
+from src.catalog import bump_catalog_version, get_catalog, invalidate_catalog
+
+
+@job("collect_tags")
+def collect_tags(progress):
+    """Add every tag used by a course to the tags table"""
+    # Set om unieke tags op te slaan
+    unique_tags = set()
+    course_tags = db.session.execute(select(Course.tags).where(Course.tags.isnot(None))).scalars().all()
+    for index, tags in enumerate(course_tags, start=1):
+        # Split tags op spaties
+        unique_tags.update(tags.split())
+        progress(0.5 * index / len(course_tags), "Tags verzamelen")
+
+    # Eén query voor alle bestaande tags in plaats van één per tag
+    existing_tags = set(db.session.execute(select(Tag.tag_name)).scalars())
+    new_tags = sorted(unique_tags - existing_tags)
+    for tag_name in new_tags:
+        db.session.add(Tag(tag_name=tag_name))
+    if new_tags:
+        bump_catalog_version()
+    db.session.commit()
+    return {"added": new_tags}
+
+
+@job("import_courses")
+def import_courses(progress, csv_file_path=None):
+    """Replace all courses with the ones in the CSV file"""
+    from src.commands import CSV_FILE_PATH, import_courses_from_csv
+
+    import_courses_from_csv(csv_file_path or CSV_FILE_PATH)
+    return {"courses": db.session.query(Course).count()}
+
+
+@job("rebuild_catalog")
+def rebuild_catalog(progress):
+    """Bump the catalogue version so every worker reloads its in-memory snapshot"""
+    bump_catalog_version()
+    db.session.commit()
+    invalidate_catalog()
+    catalog = get_catalog()
+    return {"version": catalog.version, "courses": len(catalog.courses)}
+
+
+@job("check_links")
+def check_links(progress, max_age_hours=7 * 24, deactivate=False):
+    """Check the external course links that are due for a check"""
+    from datetime import timedelta
+    from src.link_checker import run_link_check
+
+    results, deactivated, reactivated = run_link_check(timedelta(hours=max_age_hours), deactivate=deactivate)
+    return {
+        "checked": len(results),
+        "broken": [result.course_id for result in results if not result.is_ok],
+        "deactivated": deactivated,
+        "reactivated": reactivated,
+    }
+
+
+@job("reconcile_course_stats")
+def reconcile_course_stats(progress):
+    """Recompute rating_sum, rating_count and enrollment_count of every course from enrollments"""
+    enrollments = select(Enrollment).where(Enrollment.course_id == Course.id)
+    result = db.session.execute(
+        update(Course).values(
+            rating_sum=enrollments.with_only_columns(func.coalesce(func.sum(Enrollment.rating), 0)).scalar_subquery(),
+            rating_count=enrollments.with_only_columns(func.count(Enrollment.rating)).scalar_subquery(),
+            enrollment_count=enrollments.with_only_columns(func.count()).scalar_subquery(),
+        )
+    )
+    db.session.info["course_stats_dirty"] = True
+    db.session.commit()
+    return {"courses": result.rowcount}
@@ -1,8 +1,13 @@
 from flask import session
 from src.models import User
+from src.catalog import NO_STATS
 
-def calculate_relevancy_points(courses, user_tags, *args):
-    """Calculate relevancy points for each course based on matching tags"""
+def calculate_relevancy_points(courses, user_tags, stats=None):
+    """Calculate relevancy points for each course based on matching tags
+
+    Ties are broken by popularity, taken from stats (course id -> CourseStats,
+    see src.catalog.get_course_stats); without it ties keep the catalogue order.
+    """
     courses_with_points = []
     
     for course in courses:
@@ -16,8 +21,12 @@ def calculate_relevancy_points(courses, user_tags, *args):
                 
         courses_with_points.append((course, points))
     
-    # Sort courses by points (highest first)
-    sorted_courses = sorted(courses_with_points, key=lambda x: x[1], reverse=True)
+    def popularity(course):
+        course_stats = stats[course.id] if stats is not None else NO_STATS
+        return (course_stats.average_rating or 0, course_stats.enrollment_count)
+
+    # Sort courses by points (highest first); popularity breaks ties
+    sorted_courses = sorted(courses_with_points, key=lambda x: (x[1], *popularity(x[0])), reverse=True)
     return [course for course, _ in sorted_courses]
 
 def get_logged_in_user():
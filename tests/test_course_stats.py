@@ -0,0 +1,111 @@
+import pytest
+from flask import Flask
+
+from src.bootstrap import configure_db
+from src.catalog import CourseRecord, COURSE_COLUMNS
+from src.models import db, Course, Enrollment, User
+from src.utils import calculate_relevancy_points
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    configure_db(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+@pytest.fixture
+def user_id(app):
+    user = User(username="lezer", email="lezer@example.invalid")
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def add_course():
+    course = Course(title="Cursus", description="-", duration="1")
+    db.session.add(course)
+    db.session.commit()
+    return course.id
+
+
+def stats(course_id):
+    course = db.session.get(Course, course_id)
+    db.session.refresh(course)
+    return course.enrollment_count, course.rating_count, course.rating_sum
+
+
+def enroll(user_id, course_id, rating=None):
+    enrollment = Enrollment(user_id=user_id, course_id=course_id, rating=rating)
+    db.session.add(enrollment)
+    db.session.commit()
+    return enrollment
+
+
+def test_insert_counts_enrollment_and_rating(user_id):
+    course_id = add_course()
+    enroll(user_id, course_id, rating=4)
+    enroll(user_id, course_id)
+    assert stats(course_id) == (2, 1, 4)
+    assert db.session.get(Course, course_id).average_rating == 4
+
+
+def test_rating_changed_and_cleared(user_id):
+    course_id = add_course()
+    enrollment = enroll(user_id, course_id, rating=2)
+
+    enrollment.rating = 5
+    db.session.commit()
+    assert stats(course_id) == (1, 1, 5)
+
+    enrollment.rating = None
+    db.session.commit()
+    assert stats(course_id) == (1, 0, 0)
+    assert db.session.get(Course, course_id).average_rating is None
+
+
+def test_enrollment_moved_to_another_course(user_id):
+    old_course_id, new_course_id = add_course(), add_course()
+    enrollment = enroll(user_id, old_course_id, rating=3)
+
+    enrollment.course_id = new_course_id
+    enrollment.rating = 1
+    db.session.commit()
+    assert stats(old_course_id) == (0, 0, 0)
+    assert stats(new_course_id) == (1, 1, 1)
+
+
+def test_delete_removes_enrollment_and_rating(user_id):
+    course_id = add_course()
+    enrollment = enroll(user_id, course_id, rating=3)
+    enroll(user_id, course_id, rating=5)
+
+    db.session.delete(enrollment)
+    db.session.commit()
+    assert stats(course_id) == (1, 1, 5)
+
+
+def test_delete_after_unflushed_change_removes_the_stored_values(user_id):
+    old_course_id, new_course_id = add_course(), add_course()
+    enrollment = enroll(user_id, old_course_id, rating=3)
+
+    # Changed and deleted in one flush: the stored (old) course and rating are what counts
+    enrollment.course_id = new_course_id
+    enrollment.rating = 5
+    db.session.delete(enrollment)
+    db.session.commit()
+    assert stats(old_course_id) == (0, 0, 0)
+    assert stats(new_course_id) == (0, 0, 0)
+
+
+def test_relevancy_without_stats_keeps_catalogue_order_on_ties():
+    def record(id, tags):
+        values = dict.fromkeys(COURSE_COLUMNS)
+        values.update(id=id, title=f"Cursus {id}", tags=tags)
+        return CourseRecord(*(values[name] for name in COURSE_COLUMNS))
+
+    courses = [record(1, "AI"), record(2, "AI, Data"), record(3, "AI")]
+    assert [course.id for course in calculate_relevancy_points(courses, ["Data"])] == [2, 1, 3]
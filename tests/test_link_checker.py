@@ -0,0 +1,122 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+from src.bootstrap import configure_db
+from src.link_checker import LinkResult, check_links, save_results
+from src.models import db, Course
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Stand-in for a course provider: /ok, /gone (404) and /no-head (405 on HEAD)"""
+
+    def do_HEAD(self):
+        if self.path == "/no-head":
+            self.send_response(405)
+            self.end_headers()
+            return
+        self._respond()
+
+    def do_GET(self):
+        self._respond()
+
+    def _respond(self):
+        self.send_response(404 if self.path == "/gone" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def unreachable_url():
+    # Bind and close a socket to get a port nobody listens on
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+def check(*links):
+    return asyncio.run(check_links(list(enumerate(links, start=1)), retries=1, backoff=0, timeout=2))
+
+
+def test_ok_link(server_url):
+    (result,) = check(f"{server_url}/ok")
+    assert result.status == 200
+    assert result.final_url == f"{server_url}/ok"
+    assert result.is_ok
+
+
+def test_not_found_link_is_dead(server_url):
+    (result,) = check(f"{server_url}/gone")
+    assert result.status == 404
+    assert result.is_dead
+
+
+def test_head_not_allowed_falls_back_to_get(server_url):
+    (result,) = check(f"{server_url}/no-head")
+    assert result.status == 200
+    assert result.is_ok
+
+
+def test_unreachable_host_is_a_failure_not_dead(unreachable_url):
+    (result,) = check(unreachable_url)
+    assert result.status is None
+    assert result.error
+    assert result.is_failure
+    assert not result.is_dead
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    configure_db(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+def add_course(**values):
+    course = Course(title="Cursus", description="-", duration="1", link="http://example.invalid/", **values)
+    db.session.add(course)
+    db.session.commit()
+    return course.id
+
+
+def test_deactivation_and_reactivation(app):
+    gone = add_course()
+    flaky = add_course()
+    manual = add_course(status="inactive")
+
+    save_results([LinkResult(gone, "-", status=404)], deactivate=True)
+    assert db.session.get(Course, gone).status == "inactive"
+
+    # Unreachable twice is not enough, the third time in a row is
+    for expected in ("active", "active", "inactive"):
+        save_results([LinkResult(flaky, "-")], deactivate=True)
+        db.session.expire_all()
+        assert db.session.get(Course, flaky).status == expected
+
+    # Working links bring checker-deactivated courses back, but not manually deactivated ones
+    save_results([LinkResult(course_id, "-", status=200) for course_id in (gone, flaky, manual)], deactivate=True)
+    db.session.expire_all()
+    assert db.session.get(Course, gone).status == "active"
+    assert db.session.get(Course, flaky).status == "active"
+    assert db.session.get(Course, flaky).link_failures == 0
+    assert db.session.get(Course, manual).status == "inactive"
@@ -0,0 +1,35 @@
+from src.catalog import COURSE_COLUMNS, CourseRecord, CourseStatsTable
+from src.paths import build_topic_graph, _ordered_path
+
+
+def record(id, level, tags, title=None):
+    values = dict.fromkeys(COURSE_COLUMNS)
+    values.update(id=id, title=title or f"Cursus {id}", tags=tags, level_number=level, topic="DACL", status="active")
+    return CourseRecord(*(values[name] for name in COURSE_COLUMNS))
+
+
+def test_path_follows_shared_tags_not_just_order():
+    courses = [
+        record(1, 1, "Data Python", title="A"),
+        record(2, 1, "Ethiek", title="B"),
+        record(3, 2, "Ethiek Data", title="A"),  # First alphabetically, but shares fewer tags with course 1
+        record(4, 2, "Data Python", title="B"),
+        record(5, 3, "Python Pandas"),
+    ]
+    path = _ordered_path(build_topic_graph(courses), 1, CourseStatsTable())
+    assert [step["id"] for step in path] == [1, 4, 5]
+    assert path[1]["after"] == [1]
+    assert path[1]["alternatives"] == [3]
+
+
+def test_course_without_shared_tags_can_go_on_to_any_next_level():
+    courses = [record(1, 1, "Ethiek"), record(2, 2, "Python"), record(3, 2, "Data")]
+    path = _ordered_path(build_topic_graph(courses), 1, CourseStatsTable())
+    assert [step["id"] for step in path] == [1, 2]
+    assert path[1]["alternatives"] == [3]
+
+
+def test_path_starts_at_the_first_level_present():
+    courses = [record(1, 1, "Data"), record(2, 3, "Data")]
+    path = _ordered_path(build_topic_graph(courses), 2, CourseStatsTable())
+    assert [step["id"] for step in path] == [2]
@@ -0,0 +1,49 @@
+import random
+
+from src.catalog import COURSE_COLUMNS, CatalogSnapshot, CourseRecord, TagRecord
+from src.suggest import SuggestIndex, fold
+
+TITLES = ["AI en Ethiek", "Prompt Engineering", "Introductie ChatGPT", "Data & AI", "Élements of AI", "Ethiek"]
+TAGS = ["AI", "Data", "Ethiek", "Python", "GenAI", "Éthique"]
+
+
+def record(id, title, tags, status="active"):
+    values = dict.fromkeys(COURSE_COLUMNS)
+    values.update(id=id, title=title, tags=tags, status=status)
+    return CourseRecord(*(values[name] for name in COURSE_COLUMNS))
+
+
+def snapshot(version, courses, tag_names):
+    return CatalogSnapshot(version, courses, [TagRecord(id, name) for id, name in enumerate(tag_names, start=1)])
+
+
+def random_snapshot(rng, version):
+    courses = [
+        record(id, rng.choice(TITLES), " ".join(rng.sample(TAGS, rng.randint(0, 3))), rng.choice(("active", "inactive")))
+        for id in rng.sample(range(1, 30), rng.randint(0, 15))
+    ]
+    return snapshot(version, sorted(courses, key=lambda course: course.id), rng.sample(TAGS, rng.randint(0, len(TAGS))))
+
+
+def test_fold_ignores_case_and_accents():
+    assert fold("Élements of AI") == "elements of ai"
+    assert fold("ĳs") == "ijs"
+
+
+def test_accented_prefix_finds_plain_title():
+    index = SuggestIndex.build(snapshot(1, [record(1, "AI en Ethiek", "AI")], []))
+    assert [suggestion["text"] for suggestion in index.suggest("éth")] == ["AI en Ethiek"]
+    assert [suggestion["text"] for suggestion in index.suggest("ÉTH")] == ["AI en Ethiek"]
+
+
+def test_updated_index_matches_a_fresh_build():
+    rng = random.Random(42)
+    index = SuggestIndex.build(random_snapshot(rng, 1))
+    for version in range(2, 200):
+        new_snapshot = random_snapshot(rng, version)
+        index = index.updated(new_snapshot)
+        fresh = SuggestIndex.build(new_snapshot)
+        assert index.entries == fresh.entries
+        assert index.tag_counts == fresh.tag_counts
+        for prefix in ("a", "e", "pr", "da", "ét", "gen"):
+            assert index.suggest(prefix, limit=20) == fresh.suggest(prefix, limit=20)